@@ -49,7 +49,7 @@ def _get(obj: Any, name: str, default=None):
             return default
 
 
-def _drain_status(status_q: "queue.Queue[str]") -> None:
+def _drain_status(status_q: "queue.SimpleQueue[str]") -> None:
     if not status_q:
         return
     while True:
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Minimal cachestat() binding (Linux >= 6.5) via ctypes.
+
+Reports how many bytes of a file currently sit in the page cache. On
+older kernels or other platforms `cached_bytes()` returns None and
+callers fall back to the plain file size.
+"""
+from __future__ import annotations
+
+from typing import Optional
+import ctypes
+import errno
+import os
+
+# Same number on all architectures (added after the syscall table unification)
+_SYS_CACHESTAT = 451
+
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+_O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+class _CachestatRange(ctypes.Structure):
+    _fields_ = [("off", ctypes.c_uint64), ("len", ctypes.c_uint64)]
+
+
+class _Cachestat(ctypes.Structure):
+    _fields_ = [
+        ("nr_cache", ctypes.c_uint64),
+        ("nr_dirty", ctypes.c_uint64),
+        ("nr_writeback", ctypes.c_uint64),
+        ("nr_evicted", ctypes.c_uint64),
+        ("nr_recently_evicted", ctypes.c_uint64),
+    ]
+
+
+def _load_syscall():
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fn = libc.syscall
+    except (OSError, AttributeError):
+        return None
+    fn.restype = ctypes.c_long
+    return fn
+
+
+_SYSCALL = _load_syscall()
+# Cleared on the first ENOSYS so old kernels pay for one failed call only
+_available = _SYSCALL is not None
+
+
+def _open(name: str, dir_fd: Optional[int]) -> int:
+    flags = os.O_RDONLY | _O_CLOEXEC
+    if _O_NOATIME:
+        try:
+            return os.open(name, flags | _O_NOATIME, dir_fd=dir_fd)
+        except PermissionError:
+            # O_NOATIME is only allowed for the file owner
+            pass
+    return os.open(name, flags, dir_fd=dir_fd)
+
+
+def cached_bytes(name: str, dir_fd: Optional[int] = None) -> Optional[int]:
+    """
+    Bytes of `name` (relative to `dir_fd` if given) held in the page cache,
+    or None if cachestat() is not available or the file cannot be opened.
+    """
+    global _available
+    if not _available:
+        return None
+    try:
+        fd = _open(name, dir_fd)
+    except OSError:
+        return None
+    try:
+        rng = _CachestatRange(0, 0)  # len 0 -> up to end of file
+        cs = _Cachestat()
+        ret = _SYSCALL(  # type: ignore[misc]
+            ctypes.c_long(_SYS_CACHESTAT),
+            ctypes.c_int(fd),
+            ctypes.byref(rng),
+            ctypes.byref(cs),
+            ctypes.c_uint(0),
+        )
+        if ret != 0:
+            if ctypes.get_errno() == errno.ENOSYS:
+                _available = False
+            return None
+        return cs.nr_cache * _PAGE_SIZE
+    finally:
+        os.close(fd)
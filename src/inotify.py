@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Minimal inotify binding (Linux only) via ctypes.
+
+Used to wake up on file system events instead of re-scanning directories
+on a fixed interval. On platforms without inotify, `Inotify.create()`
+returns None and callers fall back to polling.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import ctypes
+import errno
+import os
+import struct
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_EVENT_HDR = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_MOUNTINFO = "/proc/self/mountinfo"
+
+# File systems whose changes all pass through the local kernel, so inotify
+# sees every one of them. Network/FUSE/WSL mounts (cifs, nfs, 9p, fuse.*)
+# can change behind our back and are not listed.
+_LOCAL_FS_TYPES = frozenset({
+    "ext2", "ext3", "ext4", "xfs", "btrfs", "f2fs", "zfs", "bcachefs",
+    "jfs", "reiserfs", "tmpfs", "overlay", "vfat", "exfat", "ntfs3",
+})
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+
+def is_local_fs(path: Union[str, Path]) -> bool:
+    """
+    True if `path` lives on a local file system (see _LOCAL_FS_TYPES),
+    looked up by st_dev in /proc/self/mountinfo. False if unknown.
+    """
+    try:
+        st = os.stat(path)
+        dev = f"{os.major(st.st_dev)}:{os.minor(st.st_dev)}".encode()
+        with open(_MOUNTINFO, "rb") as f:
+            for line in f:
+                fields = line.split()
+                if fields[2] == dev:
+                    # optional fields end with "-", followed by the fs type
+                    fstype = fields[fields.index(b"-") + 1]
+                    return os.fsdecode(fstype) in _LOCAL_FS_TYPES
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
+
+class Inotify:
+    """Thin wrapper around one inotify file descriptor."""
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+
+    @classmethod
+    def create(cls) -> Optional["Inotify"]:
+        """Return a new instance, or None if inotify is not available."""
+        if _LIBC is None:
+            return None
+        fd = _LIBC.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        return cls(fd)
+
+    def add_watch(self, path: Union[str, Path], mask: int) -> int:
+        wd = _LIBC.inotify_add_watch(self.fd, os.fsencode(path), mask)  # type: ignore[union-attr]
+        if wd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        _LIBC.inotify_rm_watch(self.fd, wd)  # type: ignore[union-attr]
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Drain all pending events as (wd, mask, name) without blocking."""
+        events: List[Tuple[int, int, str]] = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if not buf:
+                break
+            off = 0
+            while off + _EVENT_HDR.size <= len(buf):
+                wd, mask, _cookie, ln = _EVENT_HDR.unpack_from(buf, off)
+                off += _EVENT_HDR.size
+                name = buf[off:off + ln].split(b"\0", 1)[0]
+                off += ln
+                events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            finally:
+                self.fd = -1
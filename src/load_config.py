@@ -1,10 +1,4 @@
 #!/usr/bin/env python3
-from __future__ import annotations
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import List, Any, Optional
-import json, os
-
 """
 Configuration loader
 --------------------
@@ -22,10 +16,21 @@ Important fields in app.json:
 - unmount_on_exit: optional (bool)
 - nextflow_bin: optional (path to the Nextflow binary)
 """
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Any, Optional
+import json, os
 
 # Project root: one directory above /src
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
+# Required top-level fields (mounts/nextflow_bin are optional)
+_REQUIRED = frozenset(("interval_minutes", "mcquac_path", "default_pattern", "io_pairs"))
+
+# Parsed configs keyed by path: (st_mtime_ns, st_size, AppConfig)
+_CFG_CACHE: dict[Path, tuple[int, int, "AppConfig"]] = {}
+
 
 @dataclass
 class IOPair:
@@ -34,19 +39,47 @@ class IOPair:
     pattern: str
 
 
-@dataclass
 class MountEntry:
-    name: str
-    host: str
-    share: str
-    mountpoint: Path
-    username: str
-    password: str
-    domain: str | None = None
-    vers: str | None = None
-    file_mode: str = "0664"
-    dir_mode: str = "0775"
-    extra_opts: List[str] = field(default_factory=list)
+    """SMB share definition (one entry of `mounts`)."""
+
+    __slots__ = (
+        "name", "host", "share", "mountpoint", "username", "password",
+        "domain", "vers", "file_mode", "dir_mode", "extra_opts",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        share: str,
+        mountpoint: Path,
+        username: str,
+        password: str,
+        domain: str | None = None,
+        vers: str | None = None,
+        file_mode: str = "0664",
+        dir_mode: str = "0775",
+        extra_opts: List[str] | None = None,
+    ) -> None:
+        self.name = name
+        self.host = host
+        self.share = share
+        self.mountpoint = mountpoint
+        self.username = username
+        self.password = password
+        self.domain = domain
+        self.vers = vers
+        self.file_mode = file_mode
+        self.dir_mode = dir_mode
+        self.extra_opts = extra_opts if extra_opts is not None else []
+
+    def __repr__(self) -> str:
+        # password intentionally left out
+        return (
+            f"MountEntry(name={self.name!r}, host={self.host!r}, share={self.share!r}, "
+            f"mountpoint={self.mountpoint!r}, username={self.username!r}, "
+            f"domain={self.domain!r}, vers={self.vers!r})"
+        )
 
 
 @dataclass
@@ -69,6 +102,14 @@ def _expand(p: str, base: Path) -> Path:
     return (base / pp).resolve() if not pp.is_absolute() else pp.resolve()
 
 
+def _opt_str(v: Any) -> Optional[str]:
+    """Stripped string or None (for None, empty and whitespace-only values)."""
+    if v is None:
+        return None
+    s = (v if type(v) is str else str(v)).strip()
+    return s or None
+
+
 def _read_io_pairs(pairs_field: Any, default_pattern: str) -> List[IOPair]:
     if not isinstance(pairs_field, list) or not pairs_field:
         raise ValueError("'io_pairs' must be a non-empty list.")
@@ -108,9 +149,8 @@ def _read_mounts(mounts_field: Any) -> List[MountEntry]:
 
         mountpoint = _expand(mp_raw, PROJECT_ROOT)
         name = str(item.get("name") or f"{share}@{host}")
-        domain = (str(item["domain"]).strip() or None) if "domain" in item and item["domain"] is not None else None
-        vers_raw = item.get("vers", None)
-        vers = (str(vers_raw).strip() or None) if vers_raw is not None else None
+        domain = _opt_str(item.get("domain"))
+        vers = _opt_str(item.get("vers"))
         file_mode = str(item.get("file_mode", "0664"))
         dir_mode = str(item.get("dir_mode", "0775"))
 
@@ -142,18 +182,30 @@ def load_config(cfg_path: Path | None = None) -> AppConfig:
     """
     Load `config/app.json` and return a validated `AppConfig`
     (including `mounts` and `nextflow_bin`).
+
+    The parsed result is cached per path and reused as long as the file's
+    mtime and size are unchanged.
     """
     cfg_path = cfg_path or (PROJECT_ROOT / "config" / "app.json")
     if not cfg_path.is_file():
         raise FileNotFoundError(f"Configuration file not found: {cfg_path}")
+    st = cfg_path.stat()
+
+    # Unchanged since the last call -> return the already parsed config
+    cached = _CFG_CACHE.get(cfg_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # json.loads() detects the UTF encoding (incl. BOM) from the bytes itself
+    raw: Any = json.loads(cfg_path.read_bytes())
 
-    raw: Any = json.loads(cfg_path.read_text(encoding="utf-8"))
+    if not isinstance(raw, dict):
+        raise ValueError("Config must be a JSON object.")
 
-    # Check required fields (mounts/nextflow_bin are optional)
-    required = ("interval_minutes", "mcquac_path", "default_pattern", "io_pairs")
-    missing = [k for k in required if k not in raw]
+    # Check required fields
+    missing = _REQUIRED - raw.keys()
     if missing:
-        raise ValueError(f"Missing fields in config: {', '.join(missing)}")
+        raise ValueError(f"Missing fields in config: {', '.join(sorted(missing))}")
 
     # interval_minutes
     try:
@@ -184,7 +236,7 @@ def load_config(cfg_path: Path | None = None) -> AppConfig:
     continue_on_mount_error = bool(raw.get("continue_on_mount_error", False))
     unmount_on_exit = bool(raw.get("unmount_on_exit", False))
 
-    return AppConfig(
+    cfg = AppConfig(
         interval_minutes=interval_minutes,
         interval_seconds=interval_minutes * 60,
         mcquac_path=mcquac_path,
@@ -195,3 +247,5 @@ def load_config(cfg_path: Path | None = None) -> AppConfig:
         unmount_on_exit=unmount_on_exit,
         nextflow_bin=nextflow_bin,
     )
+    _CFG_CACHE[cfg_path] = (st.st_mtime_ns, st.st_size, cfg)
+    return cfg
@@ -3,18 +3,37 @@ from __future__ import annotations
 
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, Iterable, Any, Dict, Tuple
+from typing import Optional, Iterable, Iterator, Any, Dict, Tuple, Union
 import threading
 import subprocess
 import json
 from datetime import datetime
 import queue
 import os
+import select
 import shutil
+import stat
+import time
+
+from src.inotify import (
+    Inotify,
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 TMP_DEFAULT = PROJECT_ROOT / "tmp"
 
+# With inotify, tmp/ is only rescanned on events; still do a full scan
+# every this many poll intervals as a safety net
+_FULL_SCAN_EVERY = 10
+
 try:
     from src.load_config import load_config, AppConfig  # type: ignore
 except Exception:
@@ -33,6 +52,8 @@ class _RunningJob:
     log_file: Path
     proc: subprocess.Popen
     started_at: datetime
+    pidfd: Optional[int] = None  # readable once the process has exited (Linux >= 5.3)
+    info: Optional[dict] = None  # info.json, parsed once at job start
 
 
 # ----------------------------- Helper functions -----------------------------
@@ -42,31 +63,34 @@ def _iso_now() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
-def _append_line(p: Path, line: str) -> None:
+def _append_line(p: Path, *lines: str) -> None:
+    """Append one or more lines with a single open + writev (one atomic append)."""
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(line.rstrip("\n") + "\n")
+    bufs = [(ln.rstrip("\n") + "\n").encode("utf-8") for ln in lines]
+    fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+    try:
+        os.writev(fd, bufs)
+    finally:
+        os.close(fd)
 
 
 def _rename_atomic(src: Path, dst: Path) -> None:
-    if dst.exists():
-        dst.unlink()
-    src.replace(dst)
+    # rename(2) replaces an existing dst atomically
+    os.replace(src, dst)
 
 
 def _read_json(p: Path) -> Optional[Any]:
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return json.loads(p.read_bytes())
     except Exception:
         return None
 
 
-def _find_mcquac_json(hash_dir: Path) -> Optional[Path]:
+def _find_mcquac_json(hash_dir: Path, info: Optional[Any] = None) -> Optional[Path]:
     p = hash_dir / "mcquac.json"
     if p.is_file():
         return p
-    info = hash_dir / "info.json"
-    data = _read_json(info)
+    data = info if info is not None else _read_json(hash_dir / "info.json")
     try:
         cand = Path(data["paths"]["mcquac_json"])  # type: ignore[index]
         if cand.is_file():
@@ -84,15 +108,206 @@ def _resolve_main_nf(cfg_mcquac_path: Optional[Path]) -> Optional[Path]:
     return None
 
 
-def _discover_ready_dirs(tmp_dir: Path) -> Iterable[Tuple[Path, Path]]:
-    if not tmp_dir.is_dir():
-        return []
-    for child in tmp_dir.iterdir():
-        if not child.is_dir():
-            continue
-        ready = child / ".ready"
-        if ready.is_file():
-            yield child, ready
+def _discover_ready_dirs(tmp_dir: Path) -> Iterable[Tuple[Path, Path, float]]:
+    """
+    Yield (hash_dir, ready_file, ready_mtime) for every tmp/<hash>/.ready.
+    One stat per hash dir: it tells both whether .ready exists and its mtime.
+    """
+    try:
+        it = os.scandir(tmp_dir)
+    except OSError:
+        return
+    with it:
+        for e in it:
+            try:
+                if not e.is_dir():
+                    continue
+                st = os.stat(os.path.join(e.path, ".ready"))
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                child = Path(e.path)
+                yield child, child / ".ready", st.st_mtime
+
+
+class _ReadyWatcher:
+    """
+    Event source for new .ready files in tmp/<hash>/ (inotify).
+
+    Watches tmp_dir for new hash directories and every hash directory for
+    .ready being written or moved in. `drain()` returns True if a rescan of
+    tmp_dir is needed. If inotify is not available, the watch limit is hit
+    or tmp_dir itself goes away, `active` is False and the caller falls
+    back to polling. Finished hash directories are dropped via unwatch().
+    """
+
+    _ROOT_MASK = IN_CREATE | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+    _HASH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_ONLYDIR
+
+    def __init__(self, tmp_dir: Path) -> None:
+        self.tmp_dir = tmp_dir
+        self._ino = Inotify.create()
+        self._root_wd = -1
+        self._wds: Dict[str, int] = {}  # hash dir path -> wd
+        if self._ino is None:
+            return
+        try:
+            self._root_wd = self._ino.add_watch(tmp_dir, self._ROOT_MASK)
+            with os.scandir(tmp_dir) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        self._watch_hash_dir(e.path)
+        except OSError:
+            self.close()
+
+    @property
+    def active(self) -> bool:
+        return self._ino is not None
+
+    def _watch_hash_dir(self, path: str) -> None:
+        try:
+            wd = self._ino.add_watch(path, self._HASH_MASK)  # type: ignore[union-attr]
+        except (FileNotFoundError, NotADirectoryError):
+            return  # directory vanished in the meantime
+        except OSError:
+            # e.g. ENOSPC (max_user_watches reached) -> polling fallback
+            self.close()
+            return
+        self._wds[path] = wd
+
+    def unwatch(self, hash_dir: Path) -> None:
+        """Stop watching a hash directory whose job is finished."""
+        wd = self._wds.pop(os.fspath(hash_dir), None)
+        if wd is not None and self._ino is not None:
+            self._ino.rm_watch(wd)
+
+    def fileno(self) -> int:
+        return self._ino.fd if self._ino is not None else -1
+
+    def drain(self) -> bool:
+        """Consume pending events; True if tmp_dir should be rescanned."""
+        if self._ino is None:
+            return False
+        dirty = False
+        for wd, mask, name in self._ino.read_events():
+            if mask & IN_Q_OVERFLOW:
+                dirty = True
+            elif wd == self._root_wd:
+                if mask & (IN_DELETE_SELF | IN_IGNORED):
+                    # tmp_dir is gone -> polling fallback
+                    self.close()
+                    return True
+                if mask & IN_ISDIR:
+                    self._watch_hash_dir(os.path.join(self.tmp_dir, name))
+                    # .ready may already exist before the watch was added
+                    # (or the watch could not be added -> polling)
+                    if self._ino is None:
+                        return True
+                    dirty = True
+            elif name == ".ready":
+                dirty = True
+        return dirty
+
+    def close(self) -> None:
+        if self._ino is not None:
+            self._ino.close()
+            self._ino = None
+        self._wds.clear()
+
+
+class _StopEvent(threading.Event):
+    """
+    threading.Event whose set() also makes `fileno()` readable (self-pipe),
+    so _wait_events() wakes up on stop instead of at the next timeout.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        try:
+            self._r, self._w = os.pipe()
+            os.set_blocking(self._r, False)
+            os.set_blocking(self._w, False)
+        except (AttributeError, OSError):
+            self._r = self._w = -1
+
+    def fileno(self) -> int:
+        return self._r
+
+    def set(self) -> None:
+        super().set()
+        with self._lock:
+            if self._w >= 0:
+                try:
+                    os.write(self._w, b"\0")
+                except OSError:
+                    pass  # pipe full -> already readable
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in (self._r, self._w):
+                if fd >= 0:
+                    os.close(fd)
+            self._r = self._w = -1
+
+
+def _pidfd_open(pid: int) -> Optional[int]:
+    try:
+        return os.pidfd_open(pid)  # type: ignore[attr-defined]
+    except (AttributeError, OSError):
+        return None
+
+
+def _wait_events(
+    watcher: _ReadyWatcher,
+    running: Dict[Path, _RunningJob],
+    timeout: float,
+    stop_evt: threading.Event,
+) -> Tuple[bool, set]:
+    """
+    Block until a .ready event, a job exit (pidfd), stop_evt being set
+    (if it is a _StopEvent) or the timeout.
+    Returns (rescan_needed, readable_pidfds).
+
+    Uses poll() rather than select(), which fails for fds >= FD_SETSIZE.
+    Never returns without waiting: on errors it sleeps for `timeout` and
+    reports a rescan plus all pidfds, so the caller polls instead.
+    """
+    jobs = {j.pidfd: j for j in running.values() if j.pidfd is not None}
+    watch_fd = watcher.fileno() if watcher.active else -1
+    stop_fd = stop_evt.fileno() if isinstance(stop_evt, _StopEvent) else -1
+    if not jobs and watch_fd < 0 and stop_fd < 0:
+        stop_evt.wait(timeout)
+        return False, set()
+    try:
+        poller = select.poll()
+        for fd in jobs:
+            poller.register(fd, select.POLLIN)
+        for fd in (watch_fd, stop_fd):
+            if fd >= 0:
+                poller.register(fd, select.POLLIN)
+        events = poller.poll(timeout * 1000)
+    except (AttributeError, ValueError, OSError):
+        stop_evt.wait(timeout)
+        return True, set(jobs)
+    ready = set()
+    dirty = False
+    for fd, ev in events:
+        if fd == stop_fd:
+            continue  # the caller's loop checks stop_evt
+        if fd == watch_fd:
+            if ev & (select.POLLERR | select.POLLNVAL):
+                # inotify fd unusable -> polling fallback
+                watcher.close()
+                dirty = True
+            else:
+                dirty = watcher.drain() or dirty
+        else:
+            if ev & select.POLLNVAL:
+                # stale pidfd: check this job with proc.poll() every round
+                jobs[fd].pidfd = None
+            ready.add(fd)
+    return dirty, ready
 
 
 def _resolve_nextflow_bin(cfg: AppConfig) -> str:
@@ -113,6 +328,29 @@ def _resolve_nextflow_bin(cfg: AppConfig) -> str:
     return found or "nextflow"
 
 
+@dataclass
+class _RunnerCtx:
+    """Per-runner cache of the resolved main.nf and Nextflow binary."""
+
+    cfg: AppConfig
+    main_nf: Optional[Path] = None
+    nf_bin: Optional[str] = None
+    nf_bin_env: Optional[str] = None  # $NEXTFLOW_BIN the cached nf_bin was resolved with
+
+    def get_main_nf(self) -> Optional[Path]:
+        # re-resolved while missing, so a later checkout is picked up
+        if self.main_nf is None:
+            self.main_nf = _resolve_main_nf(getattr(self.cfg, "mcquac_path", None))
+        return self.main_nf
+
+    def get_nf_bin(self) -> str:
+        env = os.environ.get("NEXTFLOW_BIN")
+        if self.nf_bin is None or env != self.nf_bin_env:
+            self.nf_bin = _resolve_nextflow_bin(self.cfg)
+            self.nf_bin_env = env
+        return self.nf_bin
+
+
 # ------ Post-processing: copy output/logs, update ignore.txt, clean tmp ------
 
 
@@ -135,66 +373,233 @@ def _unique_subdir(root: Path, base_name: str) -> Path:
 
 
 def _copy_output_tree(src_dir: Path, dst_dir: Path) -> None:
-    """Copy the *contents* of src_dir into dst_dir (not the directory itself)."""
+    """
+    Copy the *contents* of src_dir into dst_dir (not the directory itself).
+
+    Single scandir pass with an explicit stack; file data goes through
+    _copy_data (kernel-side copy), mode and times come from the DirEntry
+    stat. Symlinks are followed like shutil.copytree does by default.
+    """
     if not src_dir.is_dir():
         return
-    dst_dir.mkdir(parents=True, exist_ok=True)
-    for child in src_dir.iterdir():
-        target = dst_dir / child.name
-        if child.is_dir():
-            shutil.copytree(child, target, dirs_exist_ok=True)
-        else:
-            shutil.copy2(child, target)
+    stack = [(os.fspath(src_dir), os.fspath(dst_dir))]
+    while stack:
+        src, dst = stack.pop()
+        os.makedirs(dst, exist_ok=True)
+        with os.scandir(src) as it:
+            for e in it:
+                target = os.path.join(dst, e.name)
+                if e.is_dir():
+                    stack.append((e.path, target))
+                    continue
+                st = e.stat()
+                _copy_data(e.path, target)
+                os.chmod(target, stat.S_IMODE(st.st_mode))
+                os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
 
 
-def _append_to_ignore_file(ignore_file: Path, filename: str) -> None:
-    ignore_file.parent.mkdir(parents=True, exist_ok=True)
-    line = (filename or "").strip()
-    if not line:
-        return
-    # De-duplicate: read file once, otherwise append
-    try:
-        if ignore_file.exists():
-            existing = {
-                ln.strip()
-                for ln in ignore_file.read_text(
-                    encoding="utf-8", errors="ignore"
-                ).splitlines()
-            }
-            if line in existing:
+def _copy_data(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copy a file's data kernel-side via copy_file_range (reflink/CoW where the
+    filesystem supports it). Falls back to shutil.copyfile (which uses
+    sendfile on Linux) if copy_file_range is unavailable or fails.
+    """
+    cfr = getattr(os, "copy_file_range", None)
+    if cfr is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                done = 0
+                while done < size:
+                    n = cfr(fsrc.fileno(), fdst.fileno(), size - done)
+                    if n == 0:
+                        break
+                    done += n
+            if done == size:
                 return
+        except OSError:
+            pass  # e.g. EXDEV on older kernels, ENOSYS, EINVAL on some network fs
+    shutil.copyfile(src, dst)
+
+
+def _copy_file_fast(src: Path, dst: Path) -> None:
+    """Copy data (see _copy_data) and metadata, like shutil.copy2."""
+    _copy_data(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _move_or_copy(src: Path, dst: Path, owner_dir: Path) -> None:
+    """
+    Move src to dst with a single rename if possible, otherwise copy it.
+
+    Symlinks are resolved first (Nextflow publishes outputs as links into
+    work/). The real file is only moved if it lives below `owner_dir`, i.e.
+    inside the tmp hash dir that is emptied afterwards anyway.
+    """
+    real = src.resolve()
+    try:
+        movable = real.is_relative_to(owner_dir.resolve())
     except Exception:
-        pass
-    with ignore_file.open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
+        movable = False
+    if movable:
+        try:
+            os.rename(real, dst)
+            return
+        except OSError:
+            pass  # EXDEV (different filesystem) or similar -> copy
+    _copy_file_fast(real, dst)
 
 
-def _empty_dir(d: Path) -> None:
-    """Delete the contents of a directory, keep the directory itself."""
-    if not d.exists():
+class _IgnoreWriter:
+    """
+    Append-only writer for one ignore.txt with an in-memory set of its lines.
+
+    The file stays open in append mode; its content is only (re-)read when
+    its identity, size or mtime differ from what this writer last saw
+    (e.g. a user removed an entry or replaced the file).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._seen: set[str] = set()
+        self._fh = None
+        self._sig: Optional[tuple[int, int, int, int]] = None
+
+    @staticmethod
+    def _sig_of(st: os.stat_result) -> tuple[int, int, int, int]:
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _reload(self) -> None:
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a+", encoding="utf-8", errors="ignore")
+        self._fh.seek(0)
+        self._seen = {ln.strip() for ln in self._fh.read().splitlines()}
+        self._sig = self._sig_of(os.fstat(self._fh.fileno()))
+
+    def add(self, line: str) -> None:
+        line = (line or "").strip()
+        if not line:
+            return
+        try:
+            sig = self._sig_of(os.stat(self.path))
+        except FileNotFoundError:
+            sig = None
+        if self._fh is None or sig != self._sig:
+            self._reload()
+        if line in self._seen:
+            return
+        self._fh.write(line + "\n")  # type: ignore[union-attr]
+        self._fh.flush()  # type: ignore[union-attr]
+        self._seen.add(line)
+        self._sig = self._sig_of(os.fstat(self._fh.fileno()))  # type: ignore[union-attr]
+
+    def close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+
+def _append_to_ignore_file(
+    ignore_file: Path,
+    filename: str,
+    writers: Optional[Dict[Path, _IgnoreWriter]] = None,
+) -> None:
+    """Append filename to ignore_file unless present (writers: per-file cache)."""
+    if writers is None:
+        w = _IgnoreWriter(ignore_file)
+        try:
+            w.add(filename)
+        finally:
+            w.close()
         return
-    for child in d.iterdir():
+    key = ignore_file.resolve()
+    w = writers.get(key)
+    if w is None:
+        w = writers[key] = _IgnoreWriter(key)
+    w.add(filename)
+
+
+def _iter_hdf5(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield all *.hdf5 files below root (recursively) as DirEntry objects.
+    Symlinked files count (Nextflow publishes outputs as symlinks by default),
+    symlinked directories are not descended into.
+    """
+    stack = [os.fspath(root)]
+    while stack:
         try:
-            if child.is_dir():
-                shutil.rmtree(child, ignore_errors=True)
-            else:
-                child.unlink(missing_ok=True)  # py>=3.8
-        except Exception:
-            pass
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(e.path)
+                        elif e.name.endswith(".hdf5") and e.is_file():
+                            yield e
+                    except OSError:
+                        continue
+        except OSError:
+            continue
 
 
-def _postprocess_success(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
+def _empty_dir(d: Path) -> None:
+    """
+    Delete the contents of a directory, keep the directory itself.
+
+    Iterative scandir walk: files/symlinks are unlinked using the cached
+    DirEntry type, directories are removed on the way back up. Errors are
+    ignored (best effort, like rmtree(ignore_errors=True)).
+    """
+    root = os.fspath(d)
+    stack: list[tuple[str, bool]] = [(root, False)]
+    while stack:
+        path, emptied = stack.pop()
+        if emptied:
+            if path != root:
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+            continue
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        stack.append((path, True))
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append((e.path, False))
+                    else:
+                        os.unlink(e.path)
+                except OSError:
+                    pass
+
+
+def _postprocess_success(
+    hash_dir: Path,
+    status_q: "queue.SimpleQueue[str]",
+    ignore_writers: Optional[Dict[Path, _IgnoreWriter]] = None,
+    info: Optional[Any] = None,
+) -> None:
     """
     Called when rc == 0:
 
     - Search tmp_output_dir for *.hdf5 (recursively).
     - Select the "best" file (most recently modified, then larger).
-    - Copy it as <SRC_STEM>.hdf5 directly into final_output_root.
+    - Move (same filesystem) or copy it as <SRC_STEM>.hdf5 directly into
+      final_output_root.
       Example: EXII12567std.hdf5 is placed directly in the output folder.
     - Update ignore.txt.
     - Clear tmp/<hash>/{input,output,work}.
+
+    info: parsed info.json (read from hash_dir if not given)
     """
-    info = _read_json(hash_dir / "info.json")
+    if info is None:
+        info = _read_json(hash_dir / "info.json")
     if not isinstance(info, dict):
         status_q.put(
             f"[WARN] {hash_dir.name}: info.json missing/corrupt – skipping post-processing"
@@ -221,29 +626,28 @@ def _postprocess_success(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
     try:
         final_root.mkdir(parents=True, exist_ok=True)
 
-        hdf5_files: list[Path] = []
-        if tmp_output_dir.is_dir():
-            hdf5_files = [
-                p for p in tmp_output_dir.rglob("*.hdf5") if p.is_file()
-            ]
-
-        if not hdf5_files:
+        # Single pass: keep the newest (then largest) file
+        best_key: tuple[float, int] | None = None
+        best_path = ""
+        for e in _iter_hdf5(tmp_output_dir):
+            try:
+                st = e.stat()
+                key = (float(st.st_mtime), int(st.st_size))
+            except OSError:
+                key = (0.0, 0)
+            if best_key is None or key > best_key:
+                best_key, best_path = key, e.path
+
+        if best_key is None:
             status_q.put(
                 f"[WARN] {hash_dir.name}: No .hdf5 file found in {tmp_output_dir} – "
                 "skipping output copy"
             )
             return
 
-        def _hdf5_key(p: Path) -> tuple[float, int]:
-            try:
-                st = p.stat()
-                return (float(st.st_mtime), int(st.st_size))
-            except Exception:
-                return (0.0, 0)
-
-        best_file = max(hdf5_files, key=_hdf5_key)
+        best_file = Path(best_path)
         target_file = final_root / f"{src_stem}.hdf5"
-        shutil.copy2(best_file, target_file)
+        _move_or_copy(best_file, target_file, hash_dir)
     except Exception as e:
         status_q.put(
             f"[WARN] {hash_dir.name}: Output copy (.hdf5) to '{final_root}' failed: {e}"
@@ -264,7 +668,7 @@ def _postprocess_success(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
         ignore_file = ignore_candidates[-1] if ignore_candidates else (
             final_root / "ignore.txt"
         )
-        _append_to_ignore_file(ignore_file, src_name)
+        _append_to_ignore_file(ignore_file, src_name, ignore_writers)
     except Exception as e:
         status_q.put(
             f"[WARN] {hash_dir.name}: ignore.txt update failed: {e}"
@@ -286,7 +690,11 @@ def _postprocess_success(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
     )
 
 
-def _postprocess_failure(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
+def _postprocess_failure(
+    hash_dir: Path,
+    status_q: "queue.SimpleQueue[str]",
+    info: Optional[Any] = None,
+) -> None:
     """
     Called when rc != 0.
 
@@ -294,8 +702,11 @@ def _postprocess_failure(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
         .nextflow.log in the hash directory is copied as <SRC_STEM>.error.log
         into final_output_root, e.g. EXII12567std.error.log.
     - If an .hdf5 exists, no error log is copied.
+
+    info: parsed info.json (read from hash_dir if not given)
     """
-    info = _read_json(hash_dir / "info.json")
+    if info is None:
+        info = _read_json(hash_dir / "info.json")
     if not isinstance(info, dict):
         status_q.put(
             f"[WARN] {hash_dir.name}: info.json missing/corrupt – skipping failure post-processing"
@@ -318,14 +729,7 @@ def _postprocess_failure(hash_dir: Path, status_q: "queue.Queue[str]") -> None:
         return
 
     # If an .hdf5 exists, do not create an error log
-    has_hdf5 = False
-    try:
-        if tmp_output_dir.is_dir():
-            for _ in tmp_output_dir.rglob("*.hdf5"):
-                has_hdf5 = True
-                break
-    except Exception:
-        has_hdf5 = False
+    has_hdf5 = next(_iter_hdf5(tmp_output_dir), None) is not None
 
     if has_hdf5:
         status_q.put(
@@ -368,152 +772,203 @@ def _runner_loop(
     max_parallel: int,
     poll_interval: float,
     stop_evt: threading.Event,
-    status_q: "queue.Queue[str]",
+    status_q: "queue.SimpleQueue[str]",
 ) -> None:
+    ctx = _RunnerCtx(cfg)
     running: Dict[Path, _RunningJob] = {}
+    ignore_writers: Dict[Path, _IgnoreWriter] = {}
+    watcher = _ReadyWatcher(tmp_dir)
+    # Full scan on start to pick up pre-existing .ready files
+    need_scan = True
+    last_scan = time.monotonic()
 
-    while not stop_evt.is_set():
-        # Collect finished processes
-        for hdir, job in list(running.items()):
-            rc = job.proc.poll()
-            if rc is None:
-                continue
-
-            # Post-processing for success/failure
-            try:
-                if rc == 0:
-                    _postprocess_success(hdir, status_q)
-                else:
-                    _postprocess_failure(hdir, status_q)
-            except Exception as e:
-                status_q.put(
-                    f"[WARN] {hdir.name}: post-processing error: {e}"
-                )
-
-            # Mark completion
-            try:
-                _append_line(job.working_file, f"finished: {_iso_now()}")
-                _append_line(job.working_file, f"returncode: {rc}")
-                if rc == 0:
-                    final_marker = hdir / ".finish"
-                    status_msg = f"[OK] {hdir.name} -> .finish (rc={rc})"
-                else:
-                    final_marker = hdir / ".error"
-                    status_msg = f"[ERR] {hdir.name} -> .error (rc={rc})"
-                _rename_atomic(job.working_file, final_marker)
-                status_q.put(status_msg)
-            except Exception as e:
-                status_q.put(
-                    f"[WARN] Finalization for {hdir.name} failed: {e}"
-                )
-            finally:
-                running.pop(hdir, None)
-
-        # Start new jobs
-        capacity = max(0, int(max_parallel) - len(running))
-        if capacity > 0:
-            ready_list = list(_discover_ready_dirs(tmp_dir))
-            # Oldest .ready first
-            ready_list.sort(
-                key=lambda t: (t[1].stat().st_mtime, t[0].name)
-            )
+    exited: set = set()  # pidfds reported readable by the last wait
 
-            for hdir, ready in ready_list:
-                if capacity <= 0:
-                    break
-                if hdir in running:
+    try:
+        while not stop_evt.is_set():
+            # Collect finished processes (pidfd jobs only once their fd fired)
+            for hdir, job in list(running.items()):
+                if job.pidfd is not None and job.pidfd not in exited:
                     continue
+                rc = job.proc.poll()
+                if rc is None:
+                    continue
+                if job.pidfd is not None:
+                    os.close(job.pidfd)
+                    job.pidfd = None
+                # Capacity freed -> waiting .ready dirs may be started now
+                need_scan = True
 
-                working = hdir / ".working"
+                # Post-processing for success/failure
                 try:
-                    _rename_atomic(ready, working)
-                    _append_line(working, f"started: {_iso_now()}")
+                    if rc == 0:
+                        _postprocess_success(hdir, status_q, ignore_writers, job.info)
+                    else:
+                        _postprocess_failure(hdir, status_q, job.info)
                 except Exception as e:
                     status_q.put(
-                        f"[WARN] Could not take over .ready for {hdir.name}: {e}"
+                        f"[WARN] {hdir.name}: post-processing error: {e}"
                     )
-                    continue
-
-                mcq_json = _find_mcquac_json(hdir)
-                main_nf = _resolve_main_nf(
-                    getattr(cfg, "mcquac_path", None)
-                )
-                if not mcq_json or not mcq_json.is_file() or not main_nf:
-                    _append_line(
-                        working,
-                        "error: mcquac.json or main.nf (from app.json) not found",
-                    )
-                    try:
-                        _rename_atomic(working, hdir / ".error")
-                    except Exception:
-                        pass
-                    status_q.put(
-                        f"[ERR] {hdir.name}: mcquac.json or main.nf (app.json) missing"
-                    )
-                    continue
-
-                logs_dir = hdir / "logs"
-                logs_dir.mkdir(parents=True, exist_ok=True)
-                log_file = logs_dir / (
-                    "nextflow-"
-                    + datetime.now().strftime("%Y%m%d-%H%M%S")
-                    + ".log"
-                )
-
-                nf_bin = _resolve_nextflow_bin(cfg)
-                cmd = [
-                    nf_bin,
-                    "run",
-                    "-profile",
-                    "docker",
-                    str(main_nf),
-                    "-params-file",
-                    str(mcq_json),
-                ]
-                _append_line(working, "cmd: " + " ".join(cmd))
 
+                # Mark completion
                 try:
-                    lf = log_file.open("ab", buffering=0)
-                    proc = subprocess.Popen(
-                        cmd,
-                        stdout=lf,
-                        stderr=subprocess.STDOUT,
-                        cwd=hdir,
-                        env=os.environ.copy(),
-                    )
-                    running[hdir] = _RunningJob(
-                        hash_dir=hdir,
-                        working_file=working,
-                        log_file=log_file,
-                        proc=proc,
-                        started_at=datetime.now(),
-                    )
-                    status_q.put(f"[RUN] {hdir.name}: PID {proc.pid}")
-                    capacity -= 1
-                except FileNotFoundError:
                     _append_line(
-                        working,
-                        f"error: nextflow not found (bin={nf_bin})",
+                        job.working_file,
+                        f"finished: {_iso_now()}",
+                        f"returncode: {rc}",
                     )
-                    try:
-                        _rename_atomic(working, hdir / ".error")
-                    except Exception:
-                        pass
+                    if rc == 0:
+                        final_marker = hdir / ".finish"
+                        status_msg = f"[OK] {hdir.name} -> .finish (rc={rc})"
+                    else:
+                        final_marker = hdir / ".error"
+                        status_msg = f"[ERR] {hdir.name} -> .error (rc={rc})"
+                    _rename_atomic(job.working_file, final_marker)
+                    status_q.put(status_msg)
+                except Exception as e:
                     status_q.put(
-                        f"[ERR] {hdir.name}: nextflow not found (bin={nf_bin})"
+                        f"[WARN] Finalization for {hdir.name} failed: {e}"
                     )
-                except Exception as e:
-                    _append_line(working, f"error: {e!r}")
+                finally:
+                    running.pop(hdir, None)
+                    watcher.unwatch(hdir)
+
+            # Start new jobs
+            capacity = max(0, int(max_parallel) - len(running))
+            if time.monotonic() - last_scan >= _FULL_SCAN_EVERY * poll_interval:
+                # events may have been missed (e.g. a watch that could not be added)
+                need_scan = True
+            if capacity > 0 and (need_scan or not watcher.active):
+                need_scan = False
+                last_scan = time.monotonic()
+                ready_list = list(_discover_ready_dirs(tmp_dir))
+                # Oldest .ready first
+                ready_list.sort(key=lambda t: (t[2], t[0].name))
+
+                for hdir, ready, _mtime in ready_list:
+                    if capacity <= 0:
+                        break
+                    if hdir in running:
+                        continue
+
+                    working = hdir / ".working"
                     try:
-                        _rename_atomic(working, hdir / ".error")
-                    except Exception:
-                        pass
-                    status_q.put(
-                        f"[ERR] {hdir.name}: start failed: {e!r}"
+                        _rename_atomic(ready, working)
+                        # written together with the next line (cmd/error)
+                        started_line = f"started: {_iso_now()}"
+                    except Exception as e:
+                        status_q.put(
+                            f"[WARN] Could not take over .ready for {hdir.name}: {e}"
+                        )
+                        continue
+
+                    info = _read_json(hdir / "info.json")
+                    mcq_json = _find_mcquac_json(hdir, info)
+                    main_nf = ctx.get_main_nf()
+                    if not mcq_json or not mcq_json.is_file() or not main_nf:
+                        _append_line(
+                            working,
+                            started_line,
+                            "error: mcquac.json or main.nf (from app.json) not found",
+                        )
+                        try:
+                            _rename_atomic(working, hdir / ".error")
+                        except Exception:
+                            pass
+                        status_q.put(
+                            f"[ERR] {hdir.name}: mcquac.json or main.nf (app.json) missing"
+                        )
+                        watcher.unwatch(hdir)
+                        continue
+
+                    logs_dir = hdir / "logs"
+                    logs_dir.mkdir(parents=True, exist_ok=True)
+                    log_file = logs_dir / (
+                        "nextflow-"
+                        + datetime.now().strftime("%Y%m%d-%H%M%S")
+                        + ".log"
                     )
 
-        # Small sleep via stop_evt.wait so the loop is not busy
-        stop_evt.wait(poll_interval)
+                    nf_bin = ctx.get_nf_bin()
+                    cmd = [
+                        nf_bin,
+                        "run",
+                        "-profile",
+                        "docker",
+                        str(main_nf),
+                        "-params-file",
+                        str(mcq_json),
+                    ]
+                    _append_line(working, started_line, "cmd: " + " ".join(cmd))
+
+                    try:
+                        # The child gets the log fd as stdout/stderr; the
+                        # parent's copy is closed right after the spawn.
+                        log_fd = os.open(
+                            log_file,
+                            os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC,
+                            0o644,
+                        )
+                        try:
+                            proc = subprocess.Popen(
+                                cmd,
+                                stdout=log_fd,
+                                stderr=subprocess.STDOUT,
+                                cwd=hdir,
+                                env=None,  # inherit the runner's environment as-is
+                            )
+                        finally:
+                            os.close(log_fd)
+                        running[hdir] = _RunningJob(
+                            hash_dir=hdir,
+                            working_file=working,
+                            log_file=log_file,
+                            proc=proc,
+                            started_at=datetime.now(),
+                            pidfd=_pidfd_open(proc.pid),
+                            info=info,
+                        )
+                        status_q.put(f"[RUN] {hdir.name}: PID {proc.pid}")
+                        capacity -= 1
+                    except FileNotFoundError:
+                        ctx.nf_bin = None  # resolve again for the next job
+                        _append_line(
+                            working,
+                            f"error: nextflow not found (bin={nf_bin})",
+                        )
+                        try:
+                            _rename_atomic(working, hdir / ".error")
+                        except Exception:
+                            pass
+                        status_q.put(
+                            f"[ERR] {hdir.name}: nextflow not found (bin={nf_bin})"
+                        )
+                        watcher.unwatch(hdir)
+                    except Exception as e:
+                        _append_line(working, f"error: {e!r}")
+                        try:
+                            _rename_atomic(working, hdir / ".error")
+                        except Exception:
+                            pass
+                        status_q.put(
+                            f"[ERR] {hdir.name}: start failed: {e!r}"
+                        )
+                        watcher.unwatch(hdir)
+
+            # Wait for .ready events (inotify), job exits (pidfd) or the timeout
+            dirty, exited = _wait_events(watcher, running, poll_interval, stop_evt)
+            if dirty:
+                need_scan = True
+
+    finally:
+        watcher.close()
+        if isinstance(stop_evt, _StopEvent):
+            stop_evt.close()
+        for job in running.values():
+            if job.pidfd is not None:
+                os.close(job.pidfd)
+        for w in ignore_writers.values():
+            w.close()
 
 
 def start_runner_thread(
@@ -523,8 +978,8 @@ def start_runner_thread(
     max_parallel: int = 1,
     poll_interval: float = 1.0,
 ) -> Dict[str, Any]:
-    stop_evt = threading.Event()
-    status_q: "queue.Queue[str]" = queue.Queue()
+    stop_evt = _StopEvent()
+    status_q: "queue.SimpleQueue[str]" = queue.SimpleQueue()
     t = threading.Thread(
         target=_runner_loop,
         args=(
@@ -558,12 +1013,18 @@ if __name__ == "__main__":
 
     print("MCQuaC runner started. Press Ctrl+C to exit.")
     try:
+        status_q = ctl["status"]
         while True:
             try:
-                msg = ctl["status"].get(timeout=0.5)
-                print(msg)
+                print(status_q.get(timeout=0.5))
             except queue.Empty:
-                pass
+                continue
+            # drain a burst of messages without waiting again
+            while True:
+                try:
+                    print(status_q.get_nowait())
+                except queue.Empty:
+                    break
     except KeyboardInterrupt:
         pass
     finally:
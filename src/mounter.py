@@ -1,8 +1,18 @@
 # src/mounter.py
 from __future__ import annotations
-import os, pathlib, subprocess, tempfile, socket, shutil, time
+import os, pathlib, re, subprocess, tempfile, socket, shutil, time, json, threading
+import ctypes, errno
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
+_SMB_VERSIONS = ("3.1.1", "3.0", "2.1")
+
+# Last working SMB version per host (persisted across runs)
+_VERS_CACHE_FILE = pathlib.Path(os.path.expanduser("~/.cache/mcquac/smb_vers.json"))
+_VERS_CACHE: Dict[str, str] | None = None
+_VERS_LOCK = threading.Lock()
+
+
 # --------- Helpers ---------
 def _which(name: str) -> str | None:
     return shutil.which(name)
@@ -20,8 +30,35 @@ def _is_root() -> bool:
     return os.geteuid() == 0
 
 
-def _mountpoint_active(path: str) -> bool:
-    return subprocess.run(["mountpoint", "-q", path]).returncode == 0
+_MOUNTINFO = "/proc/self/mountinfo"
+_OCTAL_ESC = re.compile(rb"\\([0-7]{3})")
+
+
+def _unescape(m: re.Match) -> bytes:
+    return bytes([int(m.group(1), 8)])
+
+
+def _mountpoints_snapshot() -> frozenset[str] | None:
+    """
+    All current mount points from /proc/self/mountinfo (field 5, octal
+    escapes like \\040 decoded). None if the file is not available.
+    """
+    try:
+        with open(_MOUNTINFO, "rb") as f:
+            return frozenset(
+                os.fsdecode(_OCTAL_ESC.sub(_unescape, line.split(b" ")[4])) for line in f
+            )
+    except (OSError, IndexError):
+        return None
+
+
+def _mountpoint_active(path: str, snapshot: frozenset[str] | None = None) -> bool:
+    if snapshot is None:
+        snapshot = _mountpoints_snapshot()
+    if snapshot is None:
+        # no /proc (non-Linux) -> ask the mountpoint tool
+        return subprocess.run(["mountpoint", "-q", path]).returncode == 0
+    return os.path.realpath(path) in snapshot
 
 
 def _try_list(path: str) -> bool:
@@ -32,7 +69,21 @@ def _try_list(path: str) -> bool:
         return False
 
 
-def _check_port(host: str, port: int = 445, timeout: float = 2.0) -> bool:
+def _wait_mounted(mountpoint: pathlib.Path, parent_dev: int, timeout: float = 0.5) -> bool:
+    """Poll until mountpoint's st_dev differs from its parent's (max `timeout` s)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if os.stat(mountpoint).st_dev != parent_dev:
+                return True
+        except OSError:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+
+
+def _check_port(host: str, port: int = 445, timeout: float = 1.0) -> bool:
     try:
         with socket.create_connection((host, port), timeout=timeout):
             return True
@@ -57,6 +108,101 @@ def _get(d: Any, key: str, default: Any = None) -> Any:
     return getattr(d, key, default)
 
 
+def _cached_vers(host: str) -> str | None:
+    global _VERS_CACHE
+    with _VERS_LOCK:
+        if _VERS_CACHE is None:
+            try:
+                data = json.loads(_VERS_CACHE_FILE.read_text(encoding="utf-8"))
+                _VERS_CACHE = {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+            except Exception:
+                _VERS_CACHE = {}
+        return _VERS_CACHE.get(host)
+
+
+def _remember_vers(host: str, vers: str) -> None:
+    with _VERS_LOCK:
+        if _VERS_CACHE is None or _VERS_CACHE.get(host) == vers:
+            return
+        _VERS_CACHE[host] = vers
+        try:
+            _VERS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _VERS_CACHE_FILE.write_text(json.dumps(_VERS_CACHE, indent=2), encoding="utf-8")
+        except Exception:
+            pass  # cache is optional
+
+
+def _vers_candidates(host: str, vers: str | None) -> list[str]:
+    """Explicit vers only; otherwise the last working one for host first."""
+    if vers:
+        return [vers]
+    cached = _cached_vers(host)
+    if cached:
+        return [cached] + [v for v in _SMB_VERSIONS if v != cached]
+    return list(_SMB_VERSIONS)
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mount.argtypes = [
+            ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_char_p,
+        ]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+# mount(2) errors that mean "let mount.cifs handle it" (module not loaded,
+# no syscall, option the kernel parser does not understand)
+_SYSCALL_FALLBACK_ERRNOS = frozenset((errno.ENODEV, errno.ENOSYS, errno.EINVAL))
+
+
+def _resolve_ip(host: str) -> str | None:
+    try:
+        return socket.getaddrinfo(host, 445, type=socket.SOCK_STREAM)[0][4][0]
+    except (OSError, IndexError):
+        return None
+
+
+def _mount_cifs_syscall(
+    host: str, share: str, mountpoint: pathlib.Path, ip: str,
+    username: str, password: str, domain: str | None, opts: list[str],
+) -> None:
+    """
+    Mount via mount(2) directly (no mount/mount.cifs processes). The kernel
+    does not resolve host names or read credential files, so the address
+    and credentials are passed inline. Only the password may contain ','
+    (escaped as ',,'); the kernel has no escape for the other options, see
+    _syscall_safe().
+    Raises OSError on failure.
+    """
+    data = [
+        f"ip={ip}",
+        f"username={username}",
+        f"password={password.replace(',', ',,')}",
+    ]
+    if domain:
+        data.append(f"domain={domain}")
+    ret = _LIBC.mount(  # type: ignore[union-attr]
+        f"//{host}/{share}".encode(),
+        os.fsencode(mountpoint),
+        b"cifs",
+        0,
+        ",".join(data + opts).encode(),
+    )
+    if ret != 0:
+        e = ctypes.get_errno()
+        raise OSError(e, os.strerror(e), str(mountpoint))
+
+
+def _syscall_safe(username: str, domain: str | None) -> bool:
+    """False if username/domain contain ',' (only mount.cifs can pass those)."""
+    return "," not in username and "," not in (domain or "")
+
+
 def _build_creds(username: str, password: str, domain: str | None) -> str:
     content = [f"username={username}", f"password={password}"]
     if domain:
@@ -69,11 +215,18 @@ def _build_creds(username: str, password: str, domain: str | None) -> str:
 
 
 # --------- Core: single SMB mount (password only from app.json) ---------
-def ensure_smb_mount(entry: Any, *, non_interactive: bool = True) -> str:
+def ensure_smb_mount(
+    entry: Any,
+    *,
+    non_interactive: bool = True,
+    mounts_snapshot: frozenset[str] | None = None,
+) -> str:
     """
     entry: dict/object with fields:
       name, host, share, mountpoint, username, password,
       domain(optional), vers(optional), file_mode/dir_mode(optional), extra_opts(optional)
+    mounts_snapshot: optional result of _mountpoints_snapshot() to reuse
+      (read fresh if omitted)
     """
     host        = _get(entry, "host")
     share       = _get(entry, "share")
@@ -93,12 +246,13 @@ def ensure_smb_mount(entry: Any, *, non_interactive: bool = True) -> str:
 
     mountpoint.mkdir(parents=True, exist_ok=True)
 
-    # Network reachable?
-    if not _ping(host) or not _check_port(host, 445):
-        raise RuntimeError(f"Host {host} not reachable (ping/port 445).")
+    # Network reachable? A TCP connect to 445 proves both; ping only as diagnostic
+    if not _check_port(host, 445):
+        ping = "ok" if _ping(host) else "no reply"
+        raise RuntimeError(f"Host {host} not reachable (port 445 closed/filtered, ping: {ping}).")
 
     # Already mounted?
-    if _mountpoint_active(str(mountpoint)):
+    if _mountpoint_active(str(mountpoint), mounts_snapshot):
         if _try_list(str(mountpoint)):
             return str(mountpoint)
         subprocess.run(
@@ -113,25 +267,44 @@ def ensure_smb_mount(entry: Any, *, non_interactive: bool = True) -> str:
         f"file_mode={file_mode}", f"dir_mode={dir_mode}",
     ] + extra_opts
 
-    vers_candidates = [vers] if vers else ["3.1.1", "3.0", "2.1"]
+    vers_candidates = _vers_candidates(host, vers)
+
+    # A mounted share has a different st_dev than the directory containing it
+    parent_dev = os.stat(mountpoint.parent).st_dev
 
-    creds_path = _build_creds(username, password, domain)
+    # Direct mount(2) first; mount.cifs (with a tmp credentials file) as fallback
+    ip = _resolve_ip(host) if (_LIBC is not None and _is_root()) else None
+    use_syscall = ip is not None and _syscall_safe(username, domain)
+    creds_path: str | None = None
     try:
         last_err = None
         for v in vers_candidates:
-            opts = base_opts + [f"credentials={creds_path}", f"vers={v}"]
-            cmd  = [
-                "mount", "-t", "cifs",
-                f"//{host}/{share}",
-                str(mountpoint),
-                "-o", ",".join(opts),
-            ]
+            opts = base_opts + [f"vers={v}"]
             try:
-                subprocess.run(cmd, check=True)
-                time.sleep(0.2)
-                if not _try_list(str(mountpoint)):
-                    raise RuntimeError("Mount succeeded, but directory listing failed.")
+                if use_syscall:
+                    try:
+                        _mount_cifs_syscall(
+                            host, share, mountpoint, ip, username, password, domain, opts
+                        )
+                    except OSError as e:
+                        if e.errno not in _SYSCALL_FALLBACK_ERRNOS:
+                            raise
+                        use_syscall = False
+                if not use_syscall:
+                    if creds_path is None:
+                        creds_path = _build_creds(username, password, domain)
+                    cmd = [
+                        "mount", "-t", "cifs",
+                        f"//{host}/{share}",
+                        str(mountpoint),
+                        "-o", ",".join(opts + [f"credentials={creds_path}"]),
+                    ]
+                    subprocess.run(cmd, check=True)
+                if not _wait_mounted(mountpoint, parent_dev):
+                    raise RuntimeError("Mount succeeded, but the mountpoint did not change.")
                 print(f"[mount] //{host}/{share} -> {mountpoint} (SMB {v})")
+                if not vers:
+                    _remember_vers(host, v)
                 return str(mountpoint)
             except subprocess.CalledProcessError as e:
                 last_err = e
@@ -139,10 +312,11 @@ def ensure_smb_mount(entry: Any, *, non_interactive: bool = True) -> str:
                 last_err = e
         raise last_err or RuntimeError("Mount failed.")
     finally:
-        try:
-            os.remove(creds_path)
-        except FileNotFoundError:
-            pass
+        if creds_path is not None:
+            try:
+                os.remove(creds_path)
+            except FileNotFoundError:
+                pass
 
 
 # --------- Public API ---------
@@ -163,25 +337,55 @@ def ensure_mounts_from_cfg(
     if not mounts:
         return {}
 
+    # one mount table read covers all entries
+    snapshot = _mountpoints_snapshot()
+
+    def _mount_one(entry: Any) -> Exception | None:
+        try:
+            ensure_smb_mount(
+                entry, non_interactive=non_interactive, mounts_snapshot=snapshot
+            )
+            return None
+        except Exception as e:
+            return e
+
+    # Mounts are almost pure network wait -> run them concurrently, unless
+    # mountpoints are nested/duplicated (then the order matters)
+    mps = [os.path.realpath(str(_get(e, "mountpoint"))) for e in mounts]
+    nested = any(
+        a == b or b.startswith(a.rstrip("/") + "/")
+        for i, a in enumerate(mps) for j, b in enumerate(mps) if i != j
+    )
+    if len(mounts) > 1 and not nested:
+        with ThreadPoolExecutor(max_workers=min(8, len(mounts))) as ex:
+            errors = list(ex.map(_mount_one, mounts))
+    else:
+        errors = []
+        for entry in mounts:
+            errors.append(_mount_one(entry))
+            if errors[-1] is not None and not best_effort:
+                break
+
+    # report in config order
     result: Dict[str, str] = {}
-    for entry in mounts:
+    for entry, err in zip(mounts, errors):
         name = _get(entry, "name", f"share@{_get(entry,'host','?')}")
-        try:
-            ensure_smb_mount(entry, non_interactive=non_interactive)
+        if err is None:
             result[name] = "OK"
-        except Exception as e:
-            msg = f"FAIL: {e}"
-            result[name] = msg
-            if not best_effort:
-                raise RuntimeError(f"Mount '{name}' failed: {e}") from e
-            print(f"[warn] {msg}")
+            continue
+        msg = f"FAIL: {err}"
+        result[name] = msg
+        if not best_effort:
+            raise RuntimeError(f"Mount '{name}' failed: {err}") from err
+        print(f"[warn] {msg}")
     return result
 
 
 def unmount_all_from_cfg(cfg: Any) -> None:
     mounts = _get(cfg, "mounts", None) or []
+    snapshot = _mountpoints_snapshot()
     for entry in mounts:
         mp = str(_get(entry, "mountpoint"))
-        if _mountpoint_active(mp):
+        if _mountpoint_active(mp, snapshot):
             subprocess.run(["umount", mp], check=False)
             print(f"[umount] {mp}")
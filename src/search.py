@@ -2,33 +2,210 @@
 from __future__ import annotations
 
 from pathlib import Path
-from collections import defaultdict
-from queue import Queue
-from datetime import datetime
+from queue import SimpleQueue
+from operator import itemgetter
 from typing import Iterable, Union, Optional, Dict, List, Callable, Tuple
+import os
+import stat
 import threading
 import time
-import fnmatch
 import hashlib
 import re
 
-from .size import file_sizes_folder  # uses your existing helper (supports .d directories)
+from .inotify import (
+    IN_CLOSE_WRITE, IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_IGNORED, IN_ISDIR,
+    IN_MODIFY, IN_MOVE_SELF, IN_MOVED_FROM, IN_MOVED_TO, IN_ONLYDIR, IN_Q_OVERFLOW,
+    Inotify, is_local_fs,
+)
+from .size import compile_ignore, compile_name_patterns, file_sizes_folder, is_name_pattern  # supports .d directories
 
 
-def _read_ignore_list(path: Path | None) -> List[str]:
+# Threads for recursive scans (one top-level subdirectory each)
+_SCAN_WORKERS = 8
+
+# With inotify, unchanged trees are not rescanned; still do a full scan
+# every this many intervals as a safety net
+_FULL_SCAN_EVERY = 10
+
+# Bound once; _make_hash runs for every new stable entry
+_BLAKE2B = hashlib.blake2b
+
+# Separators accepted between patterns in a single string, mapped to ','
+_SEP_TABLE = str.maketrans(";|", ",,")
+
+# Upper bound for the per-entry stability counter
+_MAX_STABLE_COUNT = 1_000_000
+
+# Parsed ignore files: path -> (st_mtime_ns, st_size, patterns)
+_IGNORE_CACHE: Dict[Path, Tuple[int, int, Tuple[str, ...]]] = {}
+
+
+def _read_ignore_list(path: Path | None) -> Tuple[str, ...]:
     """
-    Read an ignore file (one pattern per line) and return a list of
+    Read an ignore file (one pattern per line) and return a tuple of
     glob/fnmatch patterns. Lines starting with '#' are ignored.
+
+    The parsed result is cached per path and only re-read when mtime or
+    size of the file change, so unchanged files cost one stat per scan.
     """
-    if not path or not path.is_file():
-        return []
+    if not path:
+        return ()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ()
+    if not stat.S_ISREG(st.st_mode):
+        return ()
+
+    cached = _IGNORE_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
     lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+    patterns = tuple(ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#"))
+    _IGNORE_CACHE[path] = (st.st_mtime_ns, st.st_size, patterns)
+    return patterns
 
 
-def _normalize_patterns(pattern: Union[str, Iterable[str]]) -> List[str]:
+class _TreeWatcher:
+    """
+    Change detector for a watch folder (inotify, local file systems only).
+
+    Watches the folder itself, every .d directory below it (their contents
+    make up the bundle size) and, if `recursive`, every subdirectory.
+    `drain()` returns True if anything changed since the last call. If
+    inotify is unavailable, the watch limit is hit, the folder goes away
+    or something is mounted over it, `active` turns False and the caller
+    rescans every interval.
+
+    Changes behind a symlink (a growing link target, a symlinked .d
+    directory) produce no events; `has_symlinks` turns True once any
+    symlink shows up in a watched directory.
+    """
+
+    _MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+        | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+
+    def __init__(self, folder: Path, recursive: bool) -> None:
+        self.recursive = recursive
+        self._ino = Inotify.create() if is_local_fs(folder) else None
+        self._dirs: Dict[int, Tuple[str, bool]] = {}  # wd -> (path, inside a .d bundle)
+        self._root_wd = -1
+        self._root_dev = -1
+        self.has_symlinks = False
+        if self._ino is None:
+            return
+        try:
+            self._root_dev = os.stat(folder).st_dev
+            self._root_wd = self._ino.add_watch(folder, self._MASK)
+            self._dirs[self._root_wd] = (os.fspath(folder), False)
+            self._watch_children(os.fspath(folder), False)
+        except OSError:
+            self.close()
+
+    @property
+    def active(self) -> bool:
+        return self._ino is not None
+
+    def _wanted(self, name: str, in_bundle: bool) -> bool:
+        return self.recursive or in_bundle or name.lower().endswith(".d")
+
+    def _watch_tree(self, path: str, in_bundle: bool) -> None:
+        """Watch `path` and the relevant directories below it."""
+        try:
+            wd = self._ino.add_watch(path, self._MASK)  # type: ignore[union-attr]
+        except FileNotFoundError:
+            return  # vanished in the meantime
+        except NotADirectoryError:
+            return
+        self._dirs[wd] = (path, in_bundle)
+        self._watch_children(path, in_bundle)
+
+    def _watch_children(self, path: str, in_bundle: bool) -> None:
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+            subdirs = [e for e in entries if e.is_dir(follow_symlinks=False)]
+            if not self.has_symlinks:
+                self.has_symlinks = any(e.is_symlink() for e in entries)
+        except OSError:
+            return
+        for e in subdirs:
+            if self._wanted(e.name, in_bundle):
+                self._watch_tree(e.path, in_bundle or e.name.lower().endswith(".d"))
+
+    def drain(self) -> bool:
+        """Consume pending events; True if the folder must be rescanned."""
+        if self._ino is None:
+            return True
+        root = self._dirs.get(self._root_wd)
+        try:
+            if root is None or os.stat(root[0]).st_dev != self._root_dev:
+                # e.g. a cifs share mounted over the folder: inotify sees
+                # nothing of it -> polling fallback
+                self.close()
+                return True
+        except OSError:
+            self.close()
+            return True
+        events = self._ino.read_events()
+        try:
+            overflow = False
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    if wd == self._root_wd:
+                        # watch folder is gone/unmounted -> polling fallback
+                        self.close()
+                        return True
+                    continue
+                if wd == self._root_wd and mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self.close()
+                    return True
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    parent = self._dirs.get(wd)
+                    if parent is None:
+                        continue
+                    if mask & IN_ISDIR:
+                        if self._wanted(name, parent[1]):
+                            self._watch_tree(
+                                os.path.join(parent[0], name),
+                                parent[1] or name.lower().endswith(".d"),
+                            )
+                    elif not self.has_symlinks:
+                        # symlinks (also to directories) come without IN_ISDIR
+                        self.has_symlinks = os.path.islink(os.path.join(parent[0], name))
+            if overflow:
+                # events (maybe new directories) were lost -> re-add watches
+                self._watch_children(root[0], False)
+        except OSError:
+            # e.g. ENOSPC (max_user_watches reached) -> polling fallback
+            self.close()
+        return bool(events)
+
+    def close(self) -> None:
+        if self._ino is not None:
+            self._ino.close()
+            self._ino = None
+
+
+def _timestamp() -> str:
+    """Local time as ISO-8601 with seconds, e.g. 2024-05-01T12:00:00."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _normalize_patterns(
+    pattern: Union[str, Iterable[str]],
+) -> Tuple[List[str], Optional[re.Pattern]]:
     """
-    Normalize the pattern argument into a list of glob patterns.
+    Normalize the pattern argument into a list of glob patterns and return
+    it together with the compiled name matcher (compile_name_patterns),
+    so the regex is built once per watcher instead of once per scan.
 
     Supports:
       - simple strings: "*std.raw"
@@ -46,13 +223,9 @@ def _normalize_patterns(pattern: Union[str, Iterable[str]]) -> List[str]:
     if isinstance(pattern, str):
         s = pattern.strip()
         if not s:
-            return []
-        # Multiple patterns in a single string?
-        if any(sep in s for sep in (",", ";", "|")):
-            parts = re.split(r"[;,|]", s)
-            raw_list = [p.strip() for p in parts if p.strip()]
-        else:
-            raw_list = [s]
+            return [], None
+        # Multiple patterns in a single string? (';' and '|' -> ',')
+        raw_list = [p.strip() for p in s.translate(_SEP_TABLE).split(",") if p.strip()]
     else:
         raw_list = [str(p).strip() for p in pattern if str(p).strip()]
 
@@ -68,7 +241,7 @@ def _normalize_patterns(pattern: Union[str, Iterable[str]]) -> List[str]:
             if alt not in patterns:
                 patterns.append(alt)
 
-    return patterns
+    return patterns, compile_name_patterns(patterns)
 
 
 def _make_hash(name: str, size: int) -> str:
@@ -76,39 +249,80 @@ def _make_hash(name: str, size: int) -> str:
     Create a stable hash from name and size. This hash is used as
     directory name for tmp/<hash>/...
     """
-    h = hashlib.sha1()
     # Name may be a path or a basename; it only needs to be stable.
-    h.update(name.encode("utf-8", errors="replace"))
-    h.update(str(size).encode("ascii", errors="replace"))
-    return h.hexdigest()
+    # Not security relevant -> short blake2b digest (32 hex chars).
+    return _BLAKE2B(f"{name}|{size}".encode("utf-8", "replace"), digest_size=16).hexdigest()
+
+
+def _update_history(history: Dict[str, List[int]], sizes_now: Dict[str, int]) -> bool:
+    """
+    Advance the per-name stability counters in place with the sizes of
+    the current scan. Names that are gone are dropped, a changed size
+    restarts the counter at 1.
+
+    Returns True if the set of (name, size) pairs changed.
+    """
+    # Restrict history to current candidates (set difference runs in C)
+    gone = history.keys() - sizes_now.keys()
+    for name in gone:
+        del history[name]
+    changed = bool(gone)
+
+    get = history.get
+    for name, size in sizes_now.items():
+        entry = get(name)
+        if entry is None:
+            history[name] = [size, 1]
+            changed = True
+        elif entry[0] != size:
+            entry[0] = size
+            entry[1] = 1
+            changed = True
+        elif entry[1] < _MAX_STABLE_COUNT:
+            entry[1] += 1
+    return changed
 
 
 def _finalize_snapshot(
-    history: Dict[str, Tuple[int, int]],
+    history: Dict[str, List[int]],
     *,
     min_stable_scans: int = 2,
+    hash_cache: Optional[Dict[Tuple[str, int], str]] = None,
 ) -> List[Dict[str, Union[str, int]]]:
     """
     Create a snapshot list for the copy thread from the history.
 
-    history: { name: (size, stable_count) }
+    history: { name: [size, stable_count] }
     An entry is considered 'stable' if stable_count >= min_stable_scans.
+    hash_cache: optional { (name, size): hash } reused across scans so
+    unchanged entries are not hashed again.
     """
-    snapshot: List[Dict[str, Union[str, int]]] = []
+    if hash_cache is None:
+        hash_cache = {}
+    # (lowercased name, entry) so the sort key is computed once per entry
+    keyed: List[Tuple[str, Dict[str, Union[str, int]]]] = []
     for name, (size, stable_count) in history.items():
         if stable_count >= min_stable_scans:
-            snapshot.append(
-                {
-                    "name": name,
-                    "size": int(size),
-                    "hash": _make_hash(name, int(size)),
-                    "count": int(stable_count),
-                }
+            size = int(size)
+            key = (name, size)
+            h = hash_cache.get(key)
+            if h is None:
+                h = hash_cache[key] = _make_hash(name, size)
+            keyed.append(
+                (
+                    name.lower(),
+                    {
+                        "name": name,
+                        "size": size,
+                        "hash": h,
+                        "count": int(stable_count),
+                    },
+                )
             )
 
     # deterministic order (cosmetic only)
-    snapshot.sort(key=lambda d: str(d.get("name", "")).lower())
-    return snapshot
+    keyed.sort(key=itemgetter(0))
+    return [entry for _, entry in keyed]
 
 
 def start_watch_thread(
@@ -121,11 +335,24 @@ def start_watch_thread(
     ignore_file: Optional[Path] = None,
     extra_ignore_file: Optional[Path] = None,
     pre_scan_hook: Optional[Callable[[Path], None]] = None,
-) -> tuple[threading.Thread, Queue, threading.Event]:
+    concurrent_scan: bool = True,
+    min_stable_scans: int = 2,
+    use_inotify: bool = True,
+) -> tuple[threading.Thread, SimpleQueue, threading.Event]:
     """
     Start a background thread that scans `folder` at a fixed interval
     for matching files/directories and writes snapshots to a queue
-    once candidates are stable.
+    once candidates are stable (same size for `min_stable_scans` scans).
+
+    With `recursive` and `concurrent_scan`, the top-level subdirectories
+    of `folder` are scanned in parallel threads.
+
+    With `use_inotify` on a local file system (Linux), a scan is skipped
+    when nothing below `folder` changed since the previous one and every
+    candidate is already stable; the last sizes are reused so the
+    snapshot cadence stays the same. Only real scans make an entry
+    stable. Network mounts (SMB/NFS/WSL), directory-spanning patterns
+    ("sub/*.raw") and folders containing symlinks are always rescanned.
 
     Returns:
       (thread, queue, stop_event)
@@ -139,16 +366,29 @@ def start_watch_thread(
         raise FileNotFoundError(f"Watch folder does not exist: {folder}")
 
     # Normalize patterns (+ automatic .d completion)
-    patterns = _normalize_patterns(pattern)
+    patterns, pattern_re = _normalize_patterns(pattern)
+    # Path.glob hits may lie in directories the tree watcher does not cover
+    has_path_patterns = not all(map(is_name_pattern, patterns))
 
-    q: Queue = Queue()
+    q: SimpleQueue = SimpleQueue()
     stop_evt = threading.Event()
 
-    # History per name: (size, stable_count)
-    history: Dict[str, Tuple[int, int]] = {}
+    # History per name: [size, stable_count], updated in place every scan
+    history: Dict[str, List[int]] = {}
+    # (name, size) -> hash of entries that were already part of a snapshot
+    hash_cache: Dict[Tuple[str, int], str] = {}
 
     def _worker() -> None:
-        nonlocal history
+        # Compiled ignore set, rebuilt only when an ignore file changed
+        # (_read_ignore_list returns the same tuple object while unchanged)
+        ignore_src: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        ignore_set = None
+        # Last snapshot put on the queue (None -> rebuild from history)
+        snapshot: Optional[List[Dict[str, Union[str, int]]]] = None
+        # Last scan result, reused while inotify reports no changes
+        sizes_now: Optional[Dict[str, int]] = None
+        scans_skipped = 0
+        watcher = _TreeWatcher(folder, recursive) if use_inotify and not has_path_patterns else None
 
         while not stop_evt.is_set():
             try:
@@ -161,53 +401,75 @@ def start_watch_thread(
 
                 ig1 = _read_ignore_list(ignore_file)
                 ig2 = _read_ignore_list(extra_ignore_file)
-                # Merge (no duplicates, order irrelevant)
-                ignores = list(dict.fromkeys(ig1 + ig2))
-
-                # Determine sizes of matching files/directories
-                sizes_now = file_sizes_folder(
-                    folder=folder,
-                    pattern=patterns,
-                    ignore=ignores,
-                    recursive=recursive,
-                    print_output=False,
-                    show_full_path=use_full_path,
-                )
+                if ignore_src is None or ig1 is not ignore_src[0] or ig2 is not ignore_src[1]:
+                    # Merge (no duplicates, order irrelevant)
+                    ignore_set = compile_ignore(dict.fromkeys(ig1 + ig2))
+                    ignore_src = (ig1, ig2)
+                    sizes_now = None
+
+                # Drain before scanning: events during the scan trigger the next one
+                dirty = watcher is None or not watcher.active or watcher.drain()
+                if (
+                    dirty
+                    or sizes_now is None
+                    or scans_skipped >= _FULL_SCAN_EVERY
+                    or watcher.has_symlinks  # type: ignore[union-attr]
+                    # entries become stable only through real scans
+                    or any(entry[1] < min_stable_scans for entry in history.values())
+                ):
+                    # Determine sizes of matching files/directories
+                    sizes_now = file_sizes_folder(
+                        folder=folder,
+                        pattern=patterns,
+                        pattern_re=pattern_re,
+                        ignore_set=ignore_set,
+                        recursive=recursive,
+                        print_output=False,
+                        show_full_path=use_full_path,
+                        workers=_SCAN_WORKERS if concurrent_scan else 1,
+                    )
+                    scans_skipped = 0
+                else:
+                    # Nothing changed on disk -> same sizes as last scan
+                    scans_skipped += 1
 
                 # Update history: track stability over multiple scans
-                new_history: Dict[str, Tuple[int, int]] = {}
-
-                for name, size in sizes_now.items():
-                    prev_size, prev_count = history.get(name, (None, 0))
-                    if prev_size == size:
-                        stable_count = min(prev_count + 1, 1_000_000)
-                    else:
-                        # newly seen or size changed -> start at 1 again
-                        stable_count = 1
-                    new_history[name] = (size, stable_count)
-
-                # Restrict history to current candidates
-                history = new_history
-
-                snapshot = _finalize_snapshot(history, min_stable_scans=2)
-                ts = datetime.now().isoformat(timespec="seconds")
+                changed = _update_history(history, sizes_now)
+
+                if not changed and snapshot is not None and len(snapshot) == len(history):
+                    # Same candidates as last scan and all of them already
+                    # stable: only the counters moved -> keep hashes/order.
+                    # Still emitted every scan; the copier retries failed
+                    # copies on the next snapshot.
+                    snapshot = [{**d, "count": history[d["name"]][1]} for d in snapshot]
+                else:
+                    snapshot = _finalize_snapshot(
+                        history, min_stable_scans=min_stable_scans, hash_cache=hash_cache
+                    )
+                    # Forget hashes of entries that vanished or changed size
+                    if len(hash_cache) > len(snapshot):
+                        for key in [k for k in hash_cache if history.get(k[0], (None,))[0] != k[1]]:
+                            del hash_cache[key]
+                ts = _timestamp()
                 q.put(("snapshot", ts, snapshot))
 
             except Exception as e:
+                snapshot = None
+                sizes_now = None
                 # Send errors as events to the queue so the main thread can
                 # react/log, but keep the watcher running.
-                ts = datetime.now().isoformat(timespec="seconds")
+                ts = _timestamp()
                 q.put(("error", ts, repr(e)))
 
-            # Wait interval – with early exit if stop_evt is set
-            end_time = time.time() + max(1, int(interval_seconds))
-            while time.time() < end_time:
-                if stop_evt.is_set():
-                    break
-                time.sleep(0.2)
+            # Wait interval – returns immediately once stop_evt is set
+            if stop_evt.wait(timeout=max(1, int(interval_seconds))):
+                break
+
+        if watcher is not None:
+            watcher.close()
 
         # Optional final message
-        ts = datetime.now().isoformat(timespec="seconds")
+        ts = _timestamp()
         q.put(("stopped", ts, []))
 
     t = threading.Thread(target=_worker, daemon=True)
@@ -1,47 +1,221 @@
 #!/usr/bin/env python3
 from pathlib import Path
 import fnmatch
-from typing import Iterable, Union, Dict, List, Optional
+import os
+import re
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, FrozenSet, Iterable, Iterator, Literal, NamedTuple, Union, Dict, List, Optional, Tuple
 
+from .cachestat import cached_bytes
 
-def _dir_total_size(p: Path) -> int:
+
+# Directories are opened once and listed via their fd, so DirEntry.stat()
+# becomes fstatat(dir_fd, name) instead of a lookup of the full path.
+_SCANDIR_FD = os.scandir in os.supports_fd
+_DIR_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+# Characters that make a pattern a glob; anything else matches only itself
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _cached_size(name: str, size: int, dir_fd: Optional[int] = None) -> int:
+    """Page-cached bytes of a file of `size` bytes; `size` without cachestat()."""
+    cached = cached_bytes(name, dir_fd)
+    # the last page may extend past the end of the file
+    return size if cached is None else min(cached, size)
+
+
+def _dir_total_size(p: Union[str, Path], cached: bool = False) -> int:
     """
     Compute the total size of a directory (recursively) by summing the sizes
-    of all contained files.
+    of all contained files (with `cached`, only their page-cached part).
+
+    Works on plain path strings with os.scandir(); no Path object is
+    created per contained file. Symlinked directories are not descended
+    into, symlinked files count with the size of their target.
     """
     total = 0
-    try:
-        for child in p.rglob("*"):
-            try:
-                if child.is_file():
-                    total += child.stat().st_size
-            except Exception:
-                # Individual files may fail without blocking everything
-                continue
-    except Exception:
-        # If rglob itself fails (e.g. permissions), return 0
-        return 0
+    stack = [os.fspath(p)]
+    while stack:
+        dir_path = stack.pop()
+        fd = -1
+        try:
+            if _SCANDIR_FD:
+                fd = os.open(dir_path, _DIR_FLAGS)
+                it = os.scandir(fd)
+            else:
+                it = os.scandir(dir_path)
+        except OSError:
+            # Unreadable (sub)directories (e.g. permissions) count as 0
+            if fd >= 0:
+                os.close(fd)
+            continue
+        try:
+            with it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(os.path.join(dir_path, e.name))
+                        elif e.is_file():
+                            size = e.stat().st_size
+                            if cached:
+                                size = (
+                                    _cached_size(e.name, size, fd)
+                                    if fd >= 0
+                                    else _cached_size(e.path, size)
+                                )
+                            total += size
+                    except OSError:
+                        # Individual files may fail without blocking everything
+                        continue
+        finally:
+            if fd >= 0:
+                os.close(fd)
     return total
 
 
-def file_sizes_folder(
+def compile_globs(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Join shell-style patterns (fnmatch syntax) into a single regex so each
+    candidate string needs only one match call. Returns None if empty.
+    """
+    unique = list(dict.fromkeys(patterns))
+    if not unique:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in unique))
+
+
+def _is_literal(p: str) -> bool:
+    """True if `p` contains no glob metacharacters."""
+    return _GLOB_CHARS.isdisjoint(p)
+
+
+class IgnoreSet(NamedTuple):
+    """Ignore patterns split into exact strings and one compiled glob union."""
+
+    literals: FrozenSet[str]
+    globs: Optional[re.Pattern]
+
+
+def compile_ignore(patterns: Iterable[str]) -> IgnoreSet:
+    """
+    Compile an ignore list for file_sizes_folder(). Entries without glob
+    metacharacters (e.g. file names appended by the copier) only match
+    themselves and become a set lookup; the rest go through compile_globs().
+    """
+    literals: List[str] = []
+    globs: List[str] = []
+    for p in patterns:
+        (literals if _is_literal(p) else globs).append(p)
+    return IgnoreSet(frozenset(literals), compile_globs(globs))
+
+
+def is_name_pattern(p: str) -> bool:
+    """True if `p` only matches single names (no directory parts, no '**')."""
+    return "/" not in p and os.sep not in p and "**" not in p
+
+
+def compile_name_patterns(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Compile the name-only patterns of `patterns` (see compile_globs) as
+    used by file_sizes_folder(); directory-spanning ones are skipped.
+    """
+    return compile_globs(p for p in patterns if is_name_pattern(p))
+
+
+def _iter_entries(
+    root: str,
+    recursive: bool,
+    rel_prefix: str = "",
+    prune: Optional[Callable[[str, os.DirEntry], bool]] = None,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Yield (relative path, DirEntry) for everything below `root` using one
+    os.scandir() per directory. Symlinked directories are not descended
+    into (same as Path.rglob), nor directories for which prune(rel, entry)
+    is True.
+    """
+    stack: List[Tuple[str, str]] = [(root, rel_prefix)]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                rel = rel_dir + e.name
+                yield rel, e
+                if recursive:
+                    try:
+                        if e.is_dir(follow_symlinks=False) and not (prune and prune(rel, e)):
+                            stack.append((e.path, rel + os.sep))
+                    except OSError:
+                        pass
+
+
+def _scan_entries(
+    root: str,
+    recursive: bool,
+    workers: int = 1,
+    prune: Optional[Callable[[str, os.DirEntry], bool]] = None,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Like _iter_entries(), but for recursive scans with workers > 1 each
+    top-level subdirectory is walked in its own thread. On network mounts
+    every scandir() waits for a round trip; the walks then overlap.
+    """
+    if not recursive or workers <= 1:
+        yield from _iter_entries(root, recursive, prune=prune)
+        return
+
+    top_dirs: List[os.DirEntry] = []
+    for rel, e in _iter_entries(root, False):
+        yield rel, e
+        try:
+            if e.is_dir(follow_symlinks=False) and not (prune and prune(rel, e)):
+                top_dirs.append(e)
+        except OSError:
+            pass
+    if not top_dirs:
+        return
+
+    def walk(e: os.DirEntry) -> List[Tuple[str, os.DirEntry]]:
+        return list(_iter_entries(e.path, True, e.name + os.sep, prune))
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(top_dirs))) as ex:
+        for chunk in ex.map(walk, top_dirs):
+            yield from chunk
+
+
+def iter_file_sizes_folder(
     folder: Union[str, Path],
     pattern: Union[str, Iterable[str]] = "*.raw",
     ignore: Optional[Iterable[str]] = None,
     recursive: bool = False,
-    print_output: bool = True,
     show_full_path: bool = False,
-) -> Dict[str, int]:
+    workers: int = 1,
+    pattern_re: Optional[re.Pattern] = None,
+    ignore_set: Optional[IgnoreSet] = None,
+    sort: bool = True,
+    mode: Literal["size", "cached"] = "size",
+) -> Iterator[Tuple[str, int]]:
     """
-    List sizes (bytes) for entries in `folder`, filtered via `pattern`
-    and ignoring entries from `ignore`. Supports:
-
-      - regular files (e.g. *.raw)
-      - directories ending with '.d' (e.g. *.d), which are treated as a
-        single unit (size = sum of all contained files).
+    Generator behind file_sizes_folder(): yields (name/path, bytes).
 
-    Return value: Dict {name/path: bytes}
+    With `sort` (default) entries come in the same order as in
+    file_sizes_folder(), after the whole folder was scanned. With
+    sort=False each entry is yielded as soon as its size is known, while
+    the scan is still running, and nothing is buffered.
     """
+    if mode not in ("size", "cached"):
+        raise ValueError(f"Unknown mode: {mode!r} (expected 'size' or 'cached')")
+    cached = mode == "cached"
+    dir_size = partial(_dir_total_size, cached=True) if cached else _dir_total_size
+
     root = Path(folder).expanduser()
     if not root.is_dir():
         raise FileNotFoundError(f"Folder not found: {root}")
@@ -49,51 +223,214 @@ def file_sizes_folder(
     # pattern can be a string or an iterable of strings
     patterns: List[str] = [pattern] if isinstance(pattern, str) else list(pattern)
     ignore_list: List[str] = list(ignore or [])
+    # exact names in a set, one compiled union for the globs
+    if ignore_set is None:
+        ignore_set = compile_ignore(ignore_list)
 
-    def is_ignored(p: Path) -> bool:
-        rel = str(p.relative_to(root))
-        name = p.name
-        abs_ = str(p)
-        for ig in ignore_list:
-            if fnmatch.fnmatch(rel, ig) or fnmatch.fnmatch(name, ig) or fnmatch.fnmatch(abs_, ig):
-                return True
-        return False
-
-    # Collect files and .d directories
-    entries: set[Path] = set()
-    for pat in patterns:
-        it = root.rglob(pat) if recursive else root.glob(pat)
-        for x in it:
-            if is_ignored(x):
-                continue
-            # Always consider regular files
-            if x.is_file():
-                entries.add(x)
-            # Additionally: treat directories ending with ".d" as single units
-            elif x.is_dir() and x.name.lower().endswith(".d"):
-                entries.add(x)
-
-    if not entries:
-        if print_output:
-            print("No matching files/directories found.")
-        return {}
+    # bound once; is_ignored() runs for every pattern hit
+    ignore_literals = ignore_set.literals
+    ignore_match = ignore_set.globs.match if ignore_set.globs is not None else None
 
-    # Compute sizes & optionally print
-    results: Dict[str, int] = {}
-    for p in sorted(entries, key=lambda x: str(x.relative_to(root)).lower()):
-        if p.is_dir():
-            size = _dir_total_size(p)
-        else:
-            try:
-                size = p.stat().st_size  # bytes
-            except Exception:
-                # If stat fails, skip this entry
-                continue
+    no_ignores = not ignore_literals and ignore_match is None
+    # name -> ignored by its name alone; the same names recur across
+    # subdirectories. Scoped to this call since the ignores differ per call.
+    name_ignored: Dict[str, bool] = {}
+
+    def matches(s: str) -> bool:
+        return s in ignore_literals or (ignore_match is not None and ignore_match(s) is not None)
+
+    def is_ignored(rel: str, name: str, abs_: str) -> bool:
+        if no_ignores:
+            return False
+        # Names are the common hit, so test them first; for top-level
+        # entries rel equals name and needs no second lookup.
+        hit = name_ignored.get(name)
+        if hit is None:
+            hit = name_ignored[name] = matches(name)
+        return hit or (rel != name and matches(rel)) or matches(abs_)
+
+    # Plain name patterns are matched during a single scandir walk; patterns
+    # spanning directories ("sub/*.raw", "**") still go through Path.glob.
+    path_patterns = [p for p in patterns if not is_name_pattern(p)]
+    name_re = pattern_re if pattern_re is not None else compile_name_patterns(patterns)
+    # Only exact names at the top level: look them up instead of listing root
+    name_patterns = [p for p in patterns if is_name_pattern(p)]
+    lookup_names = (
+        list(dict.fromkeys(name_patterns))
+        if not recursive and name_patterns and all(map(_is_literal, name_patterns))
+        else None
+    )
+
+    def is_bundle(rel: str, e: os.DirEntry) -> bool:
+        # A matched .d directory is one unit: its size comes from
+        # _dir_total_size(), so the walk does not descend into it.
+        name = e.name
+        return (
+            name.lower().endswith(".d")
+            and name_re.match(name) is not None  # type: ignore[union-attr]
+            and not is_ignored(rel, name, e.path)
+        )
+
+    def candidates() -> Iterator[Tuple[str, str, str, Optional[int]]]:
+        """
+        Matching files and .d directories as (abs path, rel path, name, size).
+        File sizes are taken from the stat done while classifying the entry;
+        size is None for .d directories, which are summed afterwards.
+        """
+        # the walk yields every path once; only glob hits need de-duplication
+        seen: set = set()
+        if lookup_names is not None:
+            for name in lookup_names:
+                abs_ = os.path.join(root, name)
+                if is_ignored(name, name, abs_):
+                    continue
+                try:
+                    st = os.stat(abs_)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    size: Optional[int] = st.st_size
+                elif stat.S_ISDIR(st.st_mode) and name.lower().endswith(".d"):
+                    size = None
+                else:
+                    continue
+                if path_patterns:
+                    seen.add(abs_)
+                yield abs_, name, name, size
+        elif name_re is not None:
+            for rel, e in _scan_entries(str(root), recursive, workers, prune=is_bundle):
+                name = e.name
+                if not name_re.match(name) or is_ignored(rel, name, e.path):
+                    continue
+                try:
+                    # DirEntry answers is_file() from the cached d_type; the
+                    # stat for the size is the only syscall per file
+                    if e.is_file():
+                        size = e.stat().st_size  # bytes
+                    # Additionally: treat directories ending with ".d" as single units
+                    # (suffix first: is_dir() on a symlink would stat again)
+                    elif name.lower().endswith(".d") and e.is_dir():
+                        size = None
+                    else:
+                        continue
+                except OSError:
+                    # If stat fails, skip this entry
+                    continue
+                if path_patterns:
+                    seen.add(e.path)
+                yield e.path, rel, name, size
+        for pat in path_patterns:
+            it = root.rglob(pat) if recursive else root.glob(pat)
+            for x in it:
+                rel, abs_ = str(x.relative_to(root)), str(x)
+                if abs_ in seen or is_ignored(rel, x.name, abs_):
+                    continue
+                # one stat per hit for both the type and the size
+                try:
+                    st = os.stat(abs_)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    size = st.st_size
+                elif stat.S_ISDIR(st.st_mode) and x.name.lower().endswith(".d"):
+                    size = None
+                else:
+                    continue
+                seen.add(abs_)
+                yield abs_, rel, x.name, size
+
+    if not sort:
+        for abs_, _rel, name, size in candidates():
+            if size is None:
+                size = dir_size(abs_)
+            elif cached:
+                size = _cached_size(abs_, size)
+            yield (abs_ if show_full_path else name), size
+        return
+
+    # Collect files and .d directories as parallel lists (one slot per entry)
+    paths: List[str] = []
+    names: List[str] = []
+    sizes: List[Optional[int]] = []  # None for .d directories
+    sort_keys: List[str] = []  # relative path, lowercased
+    for abs_, rel, name, size in candidates():
+        paths.append(abs_)
+        names.append(name)
+        sizes.append(_cached_size(abs_, size) if cached and size is not None else size)
+        sort_keys.append(rel.lower())
+
+    # .d bundles are the expensive part (one stat per contained file);
+    # with workers > 1 they are summed concurrently
+    bundle_sizes: Dict[str, int] = {}
+    bundles = [abs_ for abs_, size in zip(paths, sizes) if size is None]
+    if workers > 1 and len(bundles) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(bundles))) as ex:
+            bundle_sizes = dict(zip(bundles, ex.map(dir_size, bundles)))
+
+    # File sizes are known already; only .d directories still need summing
+    for i in sorted(range(len(paths)), key=sort_keys.__getitem__):
+        abs_ = paths[i]
+        size = sizes[i]
+        if size is None:
+            size = bundle_sizes[abs_] if abs_ in bundle_sizes else dir_size(abs_)
+        yield (abs_ if show_full_path else names[i]), size
+
+
+def file_sizes_folder(
+    folder: Union[str, Path],
+    pattern: Union[str, Iterable[str]] = "*.raw",
+    ignore: Optional[Iterable[str]] = None,
+    recursive: bool = False,
+    print_output: bool = True,
+    show_full_path: bool = False,
+    workers: int = 1,
+    pattern_re: Optional[re.Pattern] = None,
+    ignore_set: Optional[IgnoreSet] = None,
+    mode: Literal["size", "cached"] = "size",
+) -> Dict[str, int]:
+    """
+    List sizes (bytes) for entries in `folder`, filtered via `pattern`
+    and ignoring entries from `ignore`. Supports:
+
+      - regular files (e.g. *.raw)
+      - directories ending with '.d' (e.g. *.d), which are treated as a
+        single unit (size = sum of all contained files). With `recursive`,
+        the walk does not descend into matched .d directories.
+
+    With workers > 1, several .d directories are summed concurrently and,
+    with `recursive`, top-level subdirectories are scanned concurrently
+    (helps on SMB/NFS mounts).
 
-        key = str(p if show_full_path else p.name)
-        results[key] = size
+    Callers that scan repeatedly can pass `pattern_re`
+    (compile_name_patterns(pattern)) and `ignore_set` (compile_ignore(ignore))
+    to skip compiling them on every call; `ignore` is then not used.
+    iter_file_sizes_folder() yields the same entries one by one.
 
-        if print_output:
-            print(f"{size}  {p if show_full_path else p.name}")
+    mode="cached" reports only the bytes currently held in the page cache
+    (Linux >= 6.5, cachestat()), e.g. to see which .d directories are hot;
+    on older kernels it falls back to the plain sizes.
 
+    Return value: Dict {name/path: bytes}
+    """
+    results: Dict[str, int] = dict(
+        iter_file_sizes_folder(
+            folder,
+            pattern,
+            ignore,
+            recursive=recursive,
+            show_full_path=show_full_path,
+            workers=workers,
+            pattern_re=pattern_re,
+            ignore_set=ignore_set,
+            mode=mode,
+        )
+    )
+
+    if print_output:
+        if not results:
+            print("No matching files/directories found.")
+        else:
+            # one write instead of a (possibly flushed) print per line
+            sys.stdout.write("".join(f"{size}  {key}\n" for key, size in results.items()))
+            sys.stdout.flush()
     return results